@@ -4,187 +4,94 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-import datetime
-import io
+import asyncio
+import audioop
+import gc
+import itertools
 import os
+import re
+import struct
 import sys
-import wave
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
-import aiofiles
+import httpx
+import numpy as np
 from dotenv import load_dotenv
 from fastapi import WebSocket
 from loguru import logger
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
+from pipecat.adapters.schemas.function_schema import FunctionSchema
+from pipecat.adapters.schemas.tools_schema import ToolsSchema
 from pipecat.audio.vad.silero import SileroVADAnalyzer
+from pipecat.frames.frames import (
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    InterimTranscriptionFrame,
+    TranscriptionFrame,
+    TTSSpeakFrame,
+)
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
-from pipecat.processors.aggregators.openai_llm_context import OpenAILLMContext
+from pipecat.processors.aggregators.openai_llm_context import (
+    OpenAILLMContext,
+    OpenAILLMContextFrame,
+)
 from pipecat.processors.audio.audio_buffer_processor import AudioBufferProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.serializers.twilio import TwilioFrameSerializer
-from pipecat.services.cartesia.tts import CartesiaTTSService
-from pipecat.services.deepgram.tts import DeepgramTTSService
 from pipecat.services.deepgram import LiveOptions
-from pipecat.services.google.tts import GoogleTTSService
 from pipecat.services.deepgram.stt import DeepgramSTTService
+from pipecat.services.llm_service import FunctionCallParams
 from pipecat.services.openai.llm import OpenAILLMService
 from pipecat.transports.network.fastapi_websocket import (
     FastAPIWebsocketParams,
     FastAPIWebsocketTransport,
 )
-from pipecat.adapters.schemas.function_schema import FunctionSchema
-from pipecat.adapters.schemas.tools_schema import ToolsSchema
-from pipecat.services.llm_service import FunctionCallParams
-from pipecat.frames.frames import EndFrame, TTSSpeakFrame
-from pipecat.transcriptions.language import Language
 
 load_dotenv(override=True)
 
-logger.remove(0)
-logger.add(sys.stderr, level="DEBUG")
+# Credentials are constant for the process lifetime; read them once at import
+# time instead of on every incoming connection.
+TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "")
+TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+DEEPGRAM_API_KEY = os.getenv("DEEPGRAM_API_KEY")
+CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY")
 
+# Call recording is opt-in; without the flag we skip the buffer processor
+# entirely so idle calls don't pay for an unused allocation.
+RECORD_AUDIO = os.getenv("RECORD_AUDIO") == "1"
 
-async def save_audio(server_name: str, audio: bytes, sample_rate: int, num_channels: int):
-    if len(audio) > 0:
-        filename = (
-            f"{server_name}_recording_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
-        )
-        with io.BytesIO() as buffer:
-            with wave.open(buffer, "wb") as wf:
-                wf.setsampwidth(2)
-                wf.setnchannels(num_channels)
-                wf.setframerate(sample_rate)
-                wf.writeframes(audio)
-            async with aiofiles.open(filename, "wb") as file:
-                await file.write(buffer.getvalue())
-        logger.info(f"Merged audio saved to {filename}")
-    else:
-        logger.info("No audio data to save")
-
-
-async def run_bot(websocket_client: WebSocket, stream_sid: str, call_sid: str, testing: bool):
-    serializer = TwilioFrameSerializer(
-        stream_sid=stream_sid,
-        call_sid=call_sid,
-        account_sid=os.getenv("TWILIO_ACCOUNT_SID", ""),
-        auth_token=os.getenv("TWILIO_AUTH_TOKEN", ""),
-    )
+# Store recordings as 8-bit μ-law WAV instead of 16-bit PCM. Twilio audio
+# originates as μ-law anyway, so this halves file size and disk bandwidth
+# with no real informational loss.
+RECORD_AUDIO_ULAW = os.getenv("RECORD_AUDIO_ULAW") == "1"
 
-    transport = FastAPIWebsocketTransport(
-        websocket=websocket_client,
-        params=FastAPIWebsocketParams(
-            audio_in_enabled=True,
-            audio_out_enabled=True,
-            add_wav_header=False,
-            vad_analyzer=SileroVADAnalyzer(),
-            serializer=serializer,
-        ),
-    )
-
-    # Define the hang up function schema
-    hang_up_function = FunctionSchema(
-        name="hang_up_call",
-        description="End the phone call when the user requests to hang up or says goodbye",
-        properties={},
-        required=[],
-    )
-    
-    # Define the switch to Spanish function schema
-    switch_to_spanish_function = FunctionSchema(
-        name="switch_to_spanish",
-        description="Switch the conversation language to Spanish when requested",
-        properties={},
-        required=[],
-    )
-    
-    # Define the switch to English function schema
-    switch_to_english_function = FunctionSchema(
-        name="switch_to_english",
-        description="Switch the conversation language back to English when requested",
-        properties={},
-        required=[],
-    )
-    
-    tools = ToolsSchema(standard_tools=[hang_up_function, switch_to_spanish_function, switch_to_english_function])
-
-    llm = OpenAILLMService(
-        api_key=os.getenv("OPENAI_API_KEY"), 
-        params=OpenAILLMService.InputParams(temperature=0.7)
-    )
+TTS_BACKEND = os.getenv("TTS_BACKEND", "cartesia")
 
-    # Define the hang up function
-    async def hang_up_call(params: FunctionCallParams):
-        logger.info("User requested to hang up the call")
-        # Return result to complete the function call
-        await params.result_callback({"status": "ending_call"})
-        # Push EndFrame to trigger Twilio auto-hangup
-        await task.queue_frames([EndFrame()])
-
-    # Define the switch to Spanish function
-    async def switch_to_spanish(params: FunctionCallParams):
-        nonlocal current_language
-        logger.info("Switching conversation to Spanish")
-        
-        # Update TTS voice to Spanish
-        tts.set_voice("6e191ac5-cac5-4055-9cb8-6b86d7833492")  # Spanish voice
-        
-        # Update the system context to Spanish
-        current_language = "es"
-        messages_list = context.get_messages()
-        messages_list[0]["content"] = generate_system_instruction("es")
-        context.set_messages(messages_list)
-        
-        # Acknowledge in Spanish
-        # await tts.queue_frame(TTSSpeakFrame("Perfecto, continuemos en español."))
-        
-        # Return result to complete the function call
-        await params.result_callback({"status": "switched_to_spanish"})
-    
-    # Define the switch to English function
-    async def switch_to_english(params: FunctionCallParams):
-        nonlocal current_language
-        logger.info("Switching conversation to English")
-        
-        # Update TTS voice back to English
-        tts.set_voice("1242fb95-7ddd-44ac-8a05-9e8a22a6137d")  # Original English voice
-        
-        # Update the system context back to English
-        current_language = "en"
-        messages_list = context.get_messages()
-        messages_list[0]["content"] = generate_system_instruction("en")
-        context.set_messages(messages_list)
-        
-        # Acknowledge in English
-        # await tts.queue_frame(TTSSpeakFrame("Great! Let's continue in English."))
-        
-        # Return result to complete the function call
-        await params.result_callback({"status": "switched_to_english"})
-    
-    # Register the functions with the LLM
-    llm.register_function("hang_up_call", hang_up_call)
-    llm.register_function("switch_to_spanish", switch_to_spanish)
-    llm.register_function("switch_to_english", switch_to_english)
-    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"), audio_passthrough=True, live_options=LiveOptions(language='multi'))
-
-
-    tts = CartesiaTTSService(
-        api_key=os.getenv("CARTESIA_API_KEY"),
-        voice_id="1242fb95-7ddd-44ac-8a05-9e8a22a6137d", #"bf0a246a-8642-498a-9950-80c35e9276b5",  #"008fa54c-4d6c-4cde-85a1-d450fe476085",#"bf0a246a-8642-498a-9950-80c35e9276b5",  # British Reading Lady
-        push_silence_after_stop=testing,
-        params=CartesiaTTSService.InputParams(
-            speed='slow',
-        )
-    )
-    # tts = DeepgramTTSService(
-    #     api_key=os.getenv("DEEPGRAM_API_KEY"),)
-    # tts = GoogleTTSService(
-    #     credentials_path='/Users/jdev/gemini/pipecat/examples/twilio-chatbot/templates/gen-lang-client-0216022548-87d2e3d641c8.json',
-    # )
-
-    # Track current language
-    current_language = "en"
-    
-    system_instruction = r"""
+logger.remove(0)
+# enqueue=True pushes log I/O to a background thread so writes on the audio
+# path never block the event loop.
+# backtrace/diagnose off: exception records skip the expensive frame
+# introspection and variable capture, which otherwise runs on the event loop
+# thread before the record is enqueued.
+logger.add(sys.stderr, level="INFO", enqueue=True, backtrace=False, diagnose=False)
+if os.getenv("PIPECAT_DEBUG"):
+    # Opt-in DEBUG capture to a file; stderr stays at INFO so per-frame debug
+    # lines never burn event-loop CPU in normal operation.
+    logger.add("pipecat-debug.log", level="DEBUG", enqueue=True, backtrace=False, diagnose=False)
+
+# The prompts are static, so compose them once at import time from named
+# section constants. The Spanish variant reuses the English conversation
+# rules and product information sections verbatim, so the two variants can't
+# drift apart and nothing is scanned or spliced at runtime.
+_EN_HEAD = r"""
 Core Identity
 You are Ellipse, a friendly AI assistant that helps apartment communities connect with prospective tenants 24/7 via phone, text, or email. You schedule tours and answer questions about properties with enthusiastic friendliness.
 
@@ -195,7 +102,9 @@ If interrupted, continue naturally without restarting.
 Keep your introduction warm but brief: "I'm excited to share how Ellipse helps property owners and managers save money while making the leasing process smoother. I help apartment communities connect with prospective tenants, answer questions, and schedule tours anytime - day or night!"
 Ask: "What would you like to know? I can explain how Ellipse works or show you a quick demonstration - whatever works best for you!"
 
-Natural Conversation Style
+"""
+
+_NATURAL_RULES = r"""Natural Conversation Style
 
 After silence, gently check in: "Are you still there? Happy to answer any questions you might have!"
 Be warm and conversational, like talking to a friend
@@ -212,7 +121,9 @@ Keep formatting simple - no special characters
 Remember the current date and time
 Sound like you're having a real conversation
 
-Call Control
+"""
+
+_CALL_CONTROL_FAIR_EN = r"""Call Control
 You can end calls when requested using the hang_up_call function.
 You can switch languages between english and spanish
 
@@ -229,7 +140,9 @@ Disability-related restrictions
 
 Respond: "I'm not able to discuss topics related to fair housing protected classes, but I'd love to tell you about the property's features, amenities, square footage, price, and availability! What would interest you most?"
 
-Information About Ellipse
+"""
+
+_INFO_RESPONSES = r"""Information About Ellipse
 What Ellipse Does
 Ellipse ensures no opportunity is missed! Properties often lose up to half their leads because of slow responses, especially when inquiries come in after hours. We make sure every prospect gets immediate, helpful attention while freeing up your agents to focus on giving great tours and taking care of residents.
 
@@ -344,10 +257,13 @@ When asked about pet amenities (Demo Mode):
 Do not use Markdown or any special characters in your responses.
 """
 
-    def generate_system_instruction(language="en"):
-        """Generate language-specific system instruction."""
-        if language == "es":
-            return f"""
+SYSTEM_INSTRUCTION = _EN_HEAD + _NATURAL_RULES + _CALL_CONTROL_FAIR_EN + _INFO_RESPONSES
+
+# Static head of every conversation; sessions copy this one-element wrapper
+# so the multi-kilobyte prompt string is shared process-wide.
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_INSTRUCTION}
+
+SYSTEM_INSTRUCTION_ES = f"""
     <<Core Identity>> 
     Eres Ellipse, un asistente de IA que ayuda a las comunidades de apartamentos a responder a las consultas de inquilinos potenciales 24/7 por teléfono, texto o correo electrónico. Programas visitas y respondes preguntas sobre las propiedades.
     </Core Identity>> 
@@ -364,7 +280,7 @@ Do not use Markdown or any special characters in your responses.
     </Interacción de Apertura>
     
     <Reglas de Conversación Natural>
-    {system_instruction[system_instruction.find("<Natural Conversation Rules>"):system_instruction.find("</Natural Conversation Rules>") + len("</Natural Conversation Rules>")]}
+    {_NATURAL_RULES}
     
     <Control de Llamada>
     Tienes la capacidad de terminar la llamada telefónica cuando se solicite. Si el usuario:
@@ -394,68 +310,729 @@ Do not use Markdown or any special characters in your responses.
     </Cumplimiento de Vivienda Justa - CRÍTICO>
     </Directrices de Conversación>>
     
-    {system_instruction[system_instruction.find("<<Information for Responses>>"):]}"""
-        else:
-            return system_instruction
+    {_INFO_RESPONSES}"""
 
-    messages = [
-        {
-            "role": "system",
-            "content": system_instruction,
-        },
-    ]
+SYSTEM_INSTRUCTIONS = {"en": SYSTEM_INSTRUCTION, "es": SYSTEM_INSTRUCTION_ES}
 
-    context = OpenAILLMContext(messages, tools)
-    context_aggregator = llm.create_context_aggregator(context)
+# The callable tools are identical for every call, so build the schemas once
+# at import instead of three pydantic model constructions per connection.
+_HANG_UP_FN = FunctionSchema(
+    name="hang_up_call",
+    description="End the phone call when the user requests to hang up or says goodbye",
+    properties={},
+    required=[],
+)
+
+_SWITCH_ES_FN = FunctionSchema(
+    name="switch_to_spanish",
+    description="Switch the conversation language to Spanish when requested",
+    properties={},
+    required=[],
+)
+
+_SWITCH_EN_FN = FunctionSchema(
+    name="switch_to_english",
+    description="Switch the conversation language back to English when requested",
+    properties={},
+    required=[],
+)
+
+_TOOLS = ToolsSchema(standard_tools=[_HANG_UP_FN, _SWITCH_ES_FN, _SWITCH_EN_FN])
+
+
+def _build_wav_header(
+    num_bytes: int, sample_rate: int, num_channels: int, sampwidth: int = 2, format_code: int = 1
+):
+    """Build a RIFF/WAVE header for PCM (format 1) or μ-law (format 7) data."""
+    byte_rate = sample_rate * num_channels * sampwidth
+    block_align = num_channels * sampwidth
+    if format_code == 1:
+        # Canonical 44-byte PCM header.
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            36 + num_bytes,
+            b"WAVE",
+            b"fmt ",
+            16,
+            1,  # PCM
+            num_channels,
+            sample_rate,
+            byte_rate,
+            block_align,
+            sampwidth * 8,
+            b"data",
+            num_bytes,
+        )
+    # Non-PCM formats use an extended fmt chunk (cbSize=0) plus a fact chunk.
+    return struct.pack(
+        "<4sI4s4sIHHIIHHH4sII4sI",
+        b"RIFF",
+        50 + num_bytes,
+        b"WAVE",
+        b"fmt ",
+        18,
+        format_code,
+        num_channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        sampwidth * 8,
+        0,  # cbSize
+        b"fact",
+        4,
+        num_bytes // block_align,
+        b"data",
+        num_bytes,
+    )
+
+
+# One pooled HTTP client for all OpenAI traffic in this process. The LLM
+# service itself is a frame processor and stays per-call, but sharing the
+# transport means warm connections (no TLS handshake) survive across calls.
+_openai_http_client = DefaultAsyncHttpxClient(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+)
 
-    # NOTE: Watch out! This will save all the conversation in memory. You can
-    # pass `buffer_size` to get periodic callbacks.
-    audiobuffer = AudioBufferProcessor()
 
-    pipeline = Pipeline(
+class SharedClientOpenAILLMService(OpenAILLMService):
+    """OpenAILLMService that reuses the process-wide pooled HTTP client."""
+
+    def create_client(self, api_key=None, base_url=None, **kwargs):
+        return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=_openai_http_client)
+
+
+def _make_tts(testing: bool):
+    """Build the configured TTS service, importing only the chosen backend.
+
+    The unused backends drag in heavy transitive dependencies (gRPC,
+    google-auth, ...), so they are imported lazily inside the matching branch
+    instead of at module import, which keeps worker cold start and baseline
+    RSS down.
+    """
+    if TTS_BACKEND == "deepgram":
+        from pipecat.services.deepgram.tts import DeepgramTTSService
+
+        return DeepgramTTSService(api_key=DEEPGRAM_API_KEY)
+    if TTS_BACKEND == "google":
+        from pipecat.services.google.tts import GoogleTTSService
+
+        return GoogleTTSService(credentials_path=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
+
+    from pipecat.services.cartesia.tts import CartesiaTTSService
+
+    return CartesiaTTSService(
+        api_key=CARTESIA_API_KEY,
+        voice_id=_EN_VOICE_ID,
+        push_silence_after_stop=testing,
+        params=CartesiaTTSService.InputParams(speed="slow"),
+    )
+
+
+class EnergyGatedSileroVAD(SileroVADAnalyzer):
+    """Silero VAD with a cheap log-energy pre-filter.
+
+    Frames whose energy stays below an adaptive noise floor (EMA tracked
+    during silence) plus a margin are reported as silence without running the
+    neural model, which skips most inferences on long, mostly-quiet calls.
+    """
+
+    def __init__(self, *, noise_floor_alpha: float = 0.01, margin_db: float = 6.0, **kwargs):
+        super().__init__(**kwargs)
+        self._noise_floor_alpha = noise_floor_alpha
+        self._margin_db = margin_db
+        self._noise_floor_db = -60.0
+
+    def voice_confidence(self, buffer) -> float:
+        samples = np.frombuffer(buffer, np.int16).astype(np.float32) / 32768.0
+        if samples.size == 0:
+            return 0
+        energy_db = 10.0 * np.log10(np.mean(samples**2) + 1e-10)
+        if energy_db < self._noise_floor_db + self._margin_db:
+            # Track the noise floor while we are (presumably) in silence.
+            self._noise_floor_db += self._noise_floor_alpha * (energy_db - self._noise_floor_db)
+            return 0
+        return super().voice_confidence(buffer)
+
+
+# Phrases that steer the conversation toward fair-housing protected classes.
+# Compiled once into a single alternation so the per-turn scan is one pass
+# over the transcript. The alternation is anchored on word boundaries so
+# substrings don't fire (e.g. "Churchill" must not match "church").
+_FAIR_HOUSING_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(
         [
-            transport.input(),  # Websocket input from client
-            stt,  # Speech-To-Text
-            context_aggregator.user(),
-            llm,  # LLM
-            tts,  # Text-To-Speech
-            transport.output(),  # Websocket output to client
-            # audiobuffer,  # Used to buffer the audio in the pipeline
-            context_aggregator.assistant(),
+            r"crime (?:rate|statistic)",
+            r"safe neighbou?rhood",
+            r"school quality",
+            r"good schools?",
+            r"family.friendly",
+            r"good for (?:families|kids|children)",
+            r"racial|ethnic|demographics?",
+            r"church(?:es)?|synagogues?|mosques?",
+            r"citizenship|immigration status|national origin",
+            r"tasa de criminalidad",
+            r"vecindario seguro",
+            r"calidad de (?:las )?escuelas",
+            r"composición racial",
+            r"étnic[ao]|demografía",
+            r"ciudadanía|estatus migratorio",
         ]
     )
+    + r")\b",
+    re.IGNORECASE,
+)
+
+_FAIR_HOUSING_RESPONSE = {
+    "en": "I'm not able to discuss topics related to fair housing protected classes, but I'd "
+    "love to tell you about the property's features, amenities, square footage, price, and "
+    "availability! What would interest you most?",
+    "es": "No puedo discutir temas que podrían relacionarse con clases protegidas de vivienda "
+    "justa. Puedo contarte sobre las características de la propiedad, amenidades, metros "
+    "cuadrados, precio y disponibilidad. ¿Te gustaría saber sobre alguno de estos aspectos?",
+}
+
+
+class FairHousingGuard(FrameProcessor):
+    """Answers fair-housing trigger phrases without an LLM round-trip.
+
+    Final transcripts matching the compiled trigger alternation get the
+    canned compliant response spoken directly and never reach the LLM,
+    saving the OpenAI round-trip and tokens for that turn. The intercepted
+    turn is appended to the conversation history so the LLM stays aware of
+    the exchange on later turns. Paraphrased questions that slip past the
+    keywords are still covered by the compliance rules in the system prompt.
+    """
+
+    def __init__(self, messages: list, **kwargs):
+        super().__init__(**kwargs)
+        self.language = "en"
+        self._messages = messages
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, TranscriptionFrame) and _FAIR_HOUSING_PATTERN.search(frame.text):
+            logger.info("Fair-housing guard intercepted a transcript")
+            response = _FAIR_HOUSING_RESPONSE[self.language]
+            # The transcript never reaches the context aggregator, so record
+            # the exchange here (append-only, like every other context write)
+            # instead of silently erasing the turn from the history.
+            self._messages.append({"role": "user", "content": frame.text})
+            self._messages.append({"role": "assistant", "content": response})
+            await self.push_frame(TTSSpeakFrame(response))
+            return
+
+        await self.push_frame(frame, direction)
+
+
+class FrameBatcher(FrameProcessor):
+    """Coalesces small inbound audio frames before the STT service.
+
+    Twilio delivers ~20 ms frames and each one would become its own Deepgram
+    WebSocket send. Accumulating ~80 ms per send quarters the syscall and WS
+    framing overhead for a negligible recognition-latency cost. Any buffered
+    audio is flushed ahead of non-audio frames so downstream ordering (e.g.
+    VAD stop events triggering a Deepgram Finalize) is preserved.
+    """
+
+    def __init__(self, *, batch_ms: int = 80, **kwargs):
+        super().__init__(**kwargs)
+        self._batch_ms = batch_ms
+        self._buffer = bytearray()
+        self._sample_rate = 0
+        self._num_channels = 1
+
+    async def _flush(self):
+        if self._buffer:
+            frame = InputAudioRawFrame(
+                audio=bytes(self._buffer),
+                sample_rate=self._sample_rate,
+                num_channels=self._num_channels,
+            )
+            self._buffer.clear()
+            await self.push_frame(frame)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InputAudioRawFrame) and direction == FrameDirection.DOWNSTREAM:
+            if frame.sample_rate != self._sample_rate:
+                await self._flush()
+                self._sample_rate = frame.sample_rate
+                self._num_channels = frame.num_channels
+            self._buffer.extend(frame.audio)
+            target = 2 * self._num_channels * (self._sample_rate * self._batch_ms // 1000)
+            if len(self._buffer) >= target:
+                await self._flush()
+            return
+
+        if direction == FrameDirection.DOWNSTREAM:
+            await self._flush()
+
+        await self.push_frame(frame, direction)
+
+
+class InterimDebouncer(FrameProcessor):
+    """Coalesces interim transcription frames before the context aggregator.
+
+    Deepgram emits interims every ~100 ms and each one walks the rest of the
+    pipeline. Finals pass through immediately; interims are held for a short
+    window and only the latest one is pushed, so superseded interims never
+    cost downstream work.
+    """
+
+    def __init__(self, *, window: float = 0.25, **kwargs):
+        super().__init__(**kwargs)
+        self._window = window
+        self._pending = None
+        self._flush_task = None
+
+    async def _flush(self):
+        await asyncio.sleep(self._window)
+        frame, direction = self._pending
+        self._pending = None
+        self._flush_task = None
+        await self.push_frame(frame, direction)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, InterimTranscriptionFrame):
+            self._pending = (frame, direction)
+            if self._flush_task is None:
+                self._flush_task = self.create_task(self._flush())
+            return
+
+        if isinstance(frame, TranscriptionFrame) and self._flush_task:
+            # The final supersedes any buffered interim.
+            await self.cancel_task(self._flush_task)
+            self._flush_task = None
+            self._pending = None
+
+        await self.push_frame(frame, direction)
+
+
+# Cartesia voice ids for each conversation language.
+_EN_VOICE_ID = "1242fb95-7ddd-44ac-8a05-9e8a22a6137d"  # British Reading Lady
+_ES_VOICE_ID = "6e191ac5-cac5-4055-9cb8-6b86d7833492"  # Spanish voice
+
+
+@dataclass
+class CallState:
+    """Per-call state shared by the LLM function-call handlers."""
+
+    task: PipelineTask
+    tts: Any
+    guard: FairHousingGuard
+    messages: list
+    language: str = "en"
+
+
+async def hang_up_call(state: CallState, params: FunctionCallParams):
+    logger.info("User requested to hang up the call")
+    # Return result to complete the function call
+    await params.result_callback({"status": "ending_call"})
+    # Push EndFrame to trigger Twilio auto-hangup
+    await state.task.queue_frames([EndFrame()])
+
+
+async def switch_to_spanish(state: CallState, params: FunctionCallParams):
+    # Redundant switches would reset the TTS voice mid-session and append a
+    # duplicate instruction for nothing; answer immediately instead.
+    if state.language == "es":
+        await params.result_callback({"status": "already_spanish"})
+        return
+
+    logger.info("Switching conversation to Spanish")
+
+    state.tts.set_voice(_ES_VOICE_ID)
+
+    state.language = "es"
+    state.guard.language = "es"
+    # Never rewrite messages[0]: provider prompt caches only hit while the
+    # prefix stays byte-identical, so the language switch is recorded as an
+    # appended system message instead of mutating the head. The call's
+    # context references this same list, so appending is enough.
+    state.messages.append({"role": "system", "content": SYSTEM_INSTRUCTIONS["es"]})
+
+    await params.result_callback({"status": "switched_to_spanish"})
+
+
+async def switch_to_english(state: CallState, params: FunctionCallParams):
+    if state.language == "en":
+        await params.result_callback({"status": "already_english"})
+        return
+
+    logger.info("Switching conversation to English")
+
+    state.tts.set_voice(_EN_VOICE_ID)
+
+    state.language = "en"
+    state.guard.language = "en"
+    # Append-only for the same prompt-cache reason as switch_to_spanish; the
+    # original English instructions are still at the head of context.
+    state.messages.append(
+        {
+            "role": "system",
+            "content": "Switch back to English and continue following the original "
+            "English instructions at the start of this conversation.",
+        }
+    )
+
+    await params.result_callback({"status": "switched_to_english"})
+
+
+class ContextCompactor(FrameProcessor):
+    """Keeps conversation history bounded before it reaches the LLM.
+
+    Once the context grows past `max_messages`, everything between the system
+    prompt and the most recent `keep_recent` messages is collapsed into a
+    single compact summary message, so per-turn prompt size (and the LLM's
+    prefill cost) stops growing with call duration.
+    """
+
+    def __init__(self, *, max_messages: int = 20, keep_recent: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self._max_messages = max_messages
+        self._keep_recent = keep_recent
+
+    def _summarize(self, dropped) -> str:
+        lines = []
+        for msg in dropped:
+            content = msg.get("content")
+            if isinstance(content, str) and content:
+                lines.append(f"{msg.get('role', 'user')}: {content[:200]}")
+        return "Summary of the earlier part of this conversation:\n" + "\n".join(lines)
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, OpenAILLMContextFrame):
+            messages = frame.context.get_messages()
+            if len(messages) > self._max_messages:
+                dropped = messages[1 : -self._keep_recent]
+                tail = messages[-self._keep_recent :]
+                # Don't strand tool results from their assistant tool call.
+                while tail and tail[0].get("role") == "tool":
+                    dropped.append(tail.pop(0))
+                # System messages carry standing instructions (e.g. language
+                # switches are recorded as appended system messages), so they
+                # pass through verbatim; only the conversational turns get
+                # collapsed into the summary.
+                kept_system = [msg for msg in dropped if msg.get("role") == "system"]
+                dropped = [msg for msg in dropped if msg.get("role") != "system"]
+                summary = {"role": "system", "content": self._summarize(dropped)}
+                frame.context.set_messages([messages[0]] + kept_system + [summary] + tail)
+
+        await self.push_frame(frame, direction)
+
+
+def get_vad() -> SileroVADAnalyzer:
+    """Build a VAD analyzer for one connection.
+
+    Each call gets its own analyzer: `VADAnalyzer` accumulates per-stream
+    state (audio buffer, VAD state machine, smoothed volume) and the Silero
+    wrapper keeps the model's RNN state, so sharing one instance across
+    concurrent calls would interleave their audio. Construction is cheap
+    because the heavyweight ONNX session is cached process-wide and shared;
+    `warmup` pre-populates that cache so the first call doesn't pay the load.
+    """
+    return EnergyGatedSileroVAD()
+
+
+# Everything in the transport params except the per-call serializer and VAD
+# analyzer is identical across connections, so build the template once and
+# clone it.
+_transport_params_template = None
+
+
+def _get_transport_params(serializer: TwilioFrameSerializer) -> FastAPIWebsocketParams:
+    global _transport_params_template
+    if _transport_params_template is None:
+        _transport_params_template = FastAPIWebsocketParams(
+            audio_in_enabled=True,
+            audio_out_enabled=True,
+            add_wav_header=False,
+        )
+    # The serializer and VAD analyzer hold per-call state, so they are set on
+    # each clone rather than baked into the shared template.
+    return _transport_params_template.model_copy(
+        update={"serializer": serializer, "vad_analyzer": get_vad()}
+    )
+
+
+# One runner serves every call: it keeps per-task bookkeeping keyed by task
+# name, so concurrent calls coexist and we skip a runner allocation per
+# connection. Created lazily because PipelineRunner needs a running loop.
+_runner = None
+
+
+def get_runner() -> PipelineRunner:
+    global _runner
+    if _runner is None:
+        # `handle_sigint=False` because uvicorn controls keyboard
+        # interruptions; `force_gc=False` because garbage collection runs on
+        # the periodic background timer (see `warmup`) instead of forcing a
+        # stop-the-world collection after every call.
+        _runner = PipelineRunner(handle_sigint=False, force_gc=False)
+    return _runner
+
+
+async def _periodic_gc(interval: float = 300):
+    """Collect garbage on a low-priority timer instead of per call."""
+    while True:
+        await asyncio.sleep(interval)
+        gc.collect()
+
+
+# Strong reference to the periodic GC task: the event loop only keeps weak
+# references to tasks, so without this the collector could be garbage
+# collected and silently stop running.
+_gc_task = None
+
+
+async def warmup():
+    """Pre-load heavy resources so the first call doesn't pay the cold start.
+
+    Loading the Silero model happens in a worker thread to keep server
+    startup responsive. Vendor clients (Deepgram/Cartesia/OpenAI) connect
+    lazily per call, but the model load is the dominant first-call cost.
+    """
+    await asyncio.to_thread(get_vad)
+    get_runner()
+    # Audio frames allocate every ~20 ms per call, so the default gen-0
+    # threshold (700 allocations) fires constantly under load. Batch young
+    # collections so per-frame jitter doesn't show up as audio glitches.
+    gc.set_threshold(100_000, 50, 50)
+    # Long-lived objects (VAD model, prompts) never need rescanning; freeze
+    # them out of future collections and sweep periodically instead of after
+    # every call.
+    gc.collect()
+    gc.freeze()
+    global _gc_task
+    _gc_task = asyncio.create_task(_periodic_gc())
+
+
+# Bound the number of concurrent background disk writers.
+_save_semaphore = asyncio.Semaphore(2)
+
+# Monotonic suffix so two recordings started within the same second (or with
+# a colliding server name) never overwrite each other.
+_save_counter = itertools.count()
+
+
+class IncrementalWavWriter:
+    """Streams a call recording to disk as audio chunks arrive.
+
+    The RIFF header is written up front with zero-length size fields and
+    patched on close, so only the current flush window lives in memory
+    instead of the whole call (~57 MB/hour at 8 kHz PCM16 per call).
+    Blocking file I/O runs in a worker thread.
+    """
+
+    def __init__(self, filename: str, sample_rate: int, num_channels: int, *, ulaw: bool = False):
+        self._filename = filename
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        self._ulaw = ulaw
+        self._sampwidth = 1 if ulaw else 2
+        self._format_code = 7 if ulaw else 1
+        self._file = None
+        self._num_bytes = 0
+        # Serializes appends against close: the final flush at disconnect is
+        # fired from a detached event-handler task, so without per-writer
+        # mutual exclusion it can interleave with the header patch.
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    def _header(self, num_bytes: int) -> bytes:
+        return _build_wav_header(
+            num_bytes, self._sample_rate, self._num_channels, self._sampwidth, self._format_code
+        )
+
+    def _append_sync(self, chunk: bytes):
+        if self._ulaw:
+            chunk = audioop.lin2ulaw(chunk, 2)
+        if self._file is None:
+            self._file = open(self._filename, "wb")
+            self._file.write(self._header(0))
+        self._file.write(chunk)
+        self._num_bytes += len(chunk)
+
+    def _close_sync(self):
+        if self._file is None:
+            return
+        # Patch the RIFF/data size fields now that the length is known.
+        self._file.seek(0)
+        self._file.write(self._header(self._num_bytes))
+        self._file.close()
+        self._file = None
+
+    async def append(self, chunk: bytes):
+        if len(chunk) == 0:
+            return
+        async with self._lock:
+            if self._closed:
+                # A flush that lost the race against close: drop it rather
+                # than reopening (and truncating) the finished file.
+                logger.warning(f"Dropping {len(chunk)} audio bytes appended after close")
+                return
+            async with _save_semaphore:
+                await asyncio.to_thread(self._append_sync, chunk)
+
+    async def close(self):
+        async with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            async with _save_semaphore:
+                await asyncio.to_thread(self._close_sync)
+        if self._num_bytes > 0:
+            logger.debug(f"Recording saved to {self._filename}")
+
+
+async def run_bot(websocket_client: WebSocket, stream_sid: str, call_sid: str, testing: bool):
+    serializer = TwilioFrameSerializer(
+        stream_sid=stream_sid,
+        call_sid=call_sid,
+        account_sid=TWILIO_ACCOUNT_SID,
+        auth_token=TWILIO_AUTH_TOKEN,
+    )
+
+    transport = FastAPIWebsocketTransport(
+        websocket=websocket_client,
+        params=_get_transport_params(serializer),
+    )
+
+    llm = SharedClientOpenAILLMService(
+        api_key=OPENAI_API_KEY, params=OpenAILLMService.InputParams(temperature=0.7)
+    )
+
+    # Tighter endpointing plus utterance-end hints cut the wait between the
+    # user finishing and the final transcript. DeepgramSTTService already
+    # sends a Finalize on UserStoppedSpeakingFrame, so the pipeline VAD closes
+    # the stream as soon as the user stops talking.
+    stt = DeepgramSTTService(
+        api_key=DEEPGRAM_API_KEY,
+        audio_passthrough=True,
+        live_options=LiveOptions(
+            language="multi",
+            interim_results=True,
+            utterance_end_ms="1000",
+            vad_events=True,
+            endpointing=300,
+        ),
+    )
+
+    tts = _make_tts(testing)
+
+    # The head message is immutable (language switches append instead of
+    # rewriting it), so every call can share the same dict and prompt string.
+    messages = [_SYSTEM_MESSAGE]
+
+    guard = FairHousingGuard(messages)
+
+    context = OpenAILLMContext(messages, _TOOLS)
+    context_aggregator = llm.create_context_aggregator(context)
+
+    audiobuffer = None
+    if RECORD_AUDIO:
+        # Flush the recording roughly every 30 seconds instead of holding the
+        # whole call in memory (8 kHz * 16-bit * 30 s per flush).
+        audiobuffer = AudioBufferProcessor(buffer_size=8000 * 2 * 30)
+
+    processors = [
+        transport.input(),  # Websocket input from client
+        FrameBatcher(),  # Coalesce ~20 ms frames into ~80 ms STT sends
+        stt,  # Speech-To-Text
+        guard,  # Canned answers for fair-housing trigger phrases
+        InterimDebouncer(),  # Coalesce interim transcripts
+        context_aggregator.user(),
+        ContextCompactor(),  # Bound history growth on long calls
+        llm,  # LLM
+        tts,  # Text-To-Speech
+        transport.output(),  # Websocket output to client
+        context_aggregator.assistant(),
+    ]
+    if audiobuffer:
+        # Tap the merged audio after the output transport.
+        processors.insert(-1, audiobuffer)
+
+    pipeline = Pipeline(processors)
 
     task = PipelineTask(
         pipeline,
         params=PipelineParams(
-            audio_in_sample_rate=8000,
+            # Barge-in: VAD start-of-speech raises an interruption that stops
+            # in-flight LLM/TTS output (and clears Twilio's buffer via the
+            # serializer), so the bot stops talking as soon as the user does.
+            allow_interruptions=True,
+            # Twilio delivers 8 kHz μ-law; the serializer upsamples to 16 kHz
+            # at the edge with the SIMD-backed SOXR resampler, which is what
+            # Deepgram's models prefer. Output stays at Twilio's 8 kHz.
+            audio_in_sample_rate=16000,
             audio_out_sample_rate=8000,
             enable_metrics=True,
             enable_usage_metrics=True,
         ),
     )
 
+    # The handlers are module-level coroutines bound to this call's state, so
+    # there are no per-call closure cells to rebuild.
+    state = CallState(task=task, tts=tts, guard=guard, messages=messages)
+    llm.register_functions(
+        {
+            "hang_up_call": partial(hang_up_call, state),
+            "switch_to_spanish": partial(switch_to_spanish, state),
+            "switch_to_english": partial(switch_to_english, state),
+        }
+    )
+
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
-        # Start recording.
-        # await audiobuffer.start_recording()
+        if audiobuffer:
+            await audiobuffer.start_recording()
         # Kick off the conversation.
-        messages.append({"role": "system", "content": "Please introduce yourself to the user."})
+        # Append the nudge as a user message at the end of the list: the
+        # system prompt stays byte-identical at index 0 across calls and the
+        # conversation only ever grows append-only, which is what lets
+        # server-side prompt-prefix caching hit on every turn.
+        messages.append({"role": "user", "content": "Please introduce yourself to the user."})
         await task.queue_frames([context_aggregator.user().get_context_frame()])
 
+    recorder = None
+
+    if audiobuffer:
+
+        @audiobuffer.event_handler("on_audio_data")
+        async def on_audio_data(buffer, audio, sample_rate, num_channels):
+            nonlocal recorder
+            if recorder is None:
+                server_name = f"server_{websocket_client.client.port}"
+                stamp = time.strftime("%Y%m%d_%H%M%S")
+                seq = next(_save_counter)
+                recorder = IncrementalWavWriter(
+                    f"{server_name}_recording_{stamp}_{seq}.wav",
+                    sample_rate,
+                    num_channels,
+                    ulaw=RECORD_AUDIO_ULAW,
+                )
+            # Each flush appends ~30 s of audio; the writer streams it to disk
+            # in a worker thread so the pipeline never blocks on file I/O.
+            await recorder.append(audio)
+
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
+        if audiobuffer:
+            # Flush the remaining buffered audio before cancelling the
+            # pipeline; the on_audio_data handler runs as a detached event
+            # task, so schedule it now and let the writer lock order it
+            # ahead of the header patch in close().
+            await audiobuffer.stop_recording()
         await task.cancel()
+        if recorder:
+            await recorder.close()
 
-    # @audiobuffer.event_handler("on_audio_data")
-    # async def on_audio_data(buffer, audio, sample_rate, num_channels):
-    #     server_name = f"server_{websocket_client.client.port}"
-    #     await save_audio(server_name, audio, sample_rate, num_channels)
-
-    # We use `handle_sigint=False` because `uvicorn` is controlling keyboard
-    # interruptions. We use `force_gc=True` to force garbage collection after
-    # the runner finishes running a task which could be useful for long running
-    # applications with multiple clients connecting.
-    runner = PipelineRunner(handle_sigint=False, force_gc=True)
-
-    await runner.run(task)
+    await get_runner().run(task)
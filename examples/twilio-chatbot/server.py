@@ -6,14 +6,34 @@
 
 import argparse
 import json
+import os
+from contextlib import asynccontextmanager
+
+try:
+    # Optional: libuv-backed event loop cuts asyncio syscall overhead on the
+    # WebSocket frame pump feeding Twilio audio.
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
 
 import uvicorn
-from bot import run_bot
+from bot import run_bot, warmup
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import HTMLResponse
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the VAD model and friends now so the first caller doesn't pay the
+    # cold-start cost.
+    await warmup()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -52,4 +72,12 @@ if __name__ == "__main__":
 
     app.state.testing = args.test
 
+    # Optionally pin this worker to a fixed CPU set (comma-separated CPU ids,
+    # e.g. PIPECAT_CPU_AFFINITY=0,1,2,3) so the event loop and the VAD
+    # inference threads stay on one chiplet instead of migrating across cores.
+    # Linux only; run one worker per CPU set when using multiple workers.
+    cpu_affinity = os.getenv("PIPECAT_CPU_AFFINITY")
+    if cpu_affinity and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {int(cpu) for cpu in cpu_affinity.split(",")})
+
     uvicorn.run(app, host="0.0.0.0", port=8765)
@@ -41,6 +41,10 @@ class BaseLLMAdapter(ABC):
     def from_standard_tools(self, tools: Any) -> List[Any]:
         """Convert tools from standard format to provider format.
 
+        The conversion result is cached per schema object, since the same
+        ToolsSchema is read on every LLM request; supply a new schema object
+        (rather than mutating one in place) to refresh the cache.
+
         Args:
             tools: Tools in standard format or provider-specific format.
 
@@ -49,8 +53,13 @@ class BaseLLMAdapter(ABC):
             if not in standard format.
         """
         if isinstance(tools, ToolsSchema):
+            cached_schema, cached_tools = getattr(self, "_converted_tools_cache", (None, None))
+            if cached_schema is tools:
+                return cached_tools
             logger.debug(f"Retrieving the tools using the adapter: {type(self)}")
-            return self.to_provider_tools_format(tools)
+            converted = self.to_provider_tools_format(tools)
+            self._converted_tools_cache = (tools, converted)
+            return converted
         # Fallback to return the same tools in case they are not in a standard format
         return tools
 
@@ -189,6 +189,17 @@ def exp_smoothing(value: float, prev_value: float, factor: float) -> float:
     return prev_value + factor * (value - prev_value)
 
 
+# μ-law conversion is a per-frame hot path for telephony transports (one
+# conversion per 20 ms frame per call), so precompute lookup tables once and
+# let NumPy do the per-sample work as a single vectorized gather. The tables
+# are generated with audioop itself, so results stay bit-identical.
+_ULAW_TO_PCM16_LUT = np.frombuffer(audioop.ulaw2lin(bytes(range(256)), 2), dtype=np.int16)
+_PCM16_TO_ULAW_LUT = np.frombuffer(
+    audioop.lin2ulaw(np.arange(65536, dtype=np.uint16).astype(np.int16).tobytes(), 2),
+    dtype=np.uint8,
+)
+
+
 async def ulaw_to_pcm(
     ulaw_bytes: bytes, in_rate: int, out_rate: int, resampler: BaseAudioResampler
 ):
@@ -203,8 +214,8 @@ async def ulaw_to_pcm(
     Returns:
         PCM audio data as raw bytes at the specified output rate.
     """
-    # Convert μ-law to PCM
-    in_pcm_bytes = audioop.ulaw2lin(ulaw_bytes, 2)
+    # Convert μ-law to PCM with a single vectorized table lookup
+    in_pcm_bytes = _ULAW_TO_PCM16_LUT[np.frombuffer(ulaw_bytes, dtype=np.uint8)].tobytes()
 
     # Resample
     out_pcm_bytes = await resampler.resample(in_pcm_bytes, in_rate, out_rate)
@@ -227,8 +238,8 @@ async def pcm_to_ulaw(pcm_bytes: bytes, in_rate: int, out_rate: int, resampler:
     # Resample
     in_pcm_bytes = await resampler.resample(pcm_bytes, in_rate, out_rate)
 
-    # Convert PCM to μ-law
-    out_ulaw_bytes = audioop.lin2ulaw(in_pcm_bytes, 2)
+    # Convert PCM to μ-law with a single vectorized table lookup
+    out_ulaw_bytes = _PCM16_TO_ULAW_LUT[np.frombuffer(in_pcm_bytes, dtype=np.uint16)].tobytes()
 
     return out_ulaw_bytes
 
@@ -31,12 +31,40 @@ except ModuleNotFoundError as e:
     raise Exception(f"Missing module(s): {e}")
 
 
+# The ONNX session is read-only after load and its run() is thread-safe, so
+# one session per model file can back any number of analyzers; only the small
+# per-stream state tensors live in each SileroOnnxModel instance.
+_session_cache = {}
+
+
+def _get_onnx_session(path, force_onnx_cpu=True):
+    """Get (or create) the shared ONNX inference session for a model file."""
+    key = (str(path), force_onnx_cpu)
+    session = _session_cache.get(key)
+    if session is None:
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        if force_onnx_cpu and "CPUExecutionProvider" in onnxruntime.get_available_providers():
+            session = onnxruntime.InferenceSession(
+                path, providers=["CPUExecutionProvider"], sess_options=opts
+            )
+        else:
+            session = onnxruntime.InferenceSession(path, sess_options=opts)
+
+        _session_cache[key] = session
+    return session
+
+
 class SileroOnnxModel:
     """ONNX runtime wrapper for the Silero VAD model.
 
     Provides voice activity detection using the pre-trained Silero VAD model
     with ONNX runtime for efficient inference. Handles model state management
-    and input validation for audio processing.
+    and input validation for audio processing. The underlying inference
+    session is shared process-wide; each instance only holds per-stream state.
     """
 
     def __init__(self, path, force_onnx_cpu=True):
@@ -46,16 +74,7 @@ class SileroOnnxModel:
             path: Path to the ONNX model file.
             force_onnx_cpu: Whether to force CPU execution provider.
         """
-        opts = onnxruntime.SessionOptions()
-        opts.inter_op_num_threads = 1
-        opts.intra_op_num_threads = 1
-
-        if force_onnx_cpu and "CPUExecutionProvider" in onnxruntime.get_available_providers():
-            self.session = onnxruntime.InferenceSession(
-                path, providers=["CPUExecutionProvider"], sess_options=opts
-            )
-        else:
-            self.session = onnxruntime.InferenceSession(path, sess_options=opts)
+        self.session = _get_onnx_session(path, force_onnx_cpu=force_onnx_cpu)
 
         self.reset_states()
         self.sample_rates = [8000, 16000]
@@ -135,12 +154,20 @@ class SileroVADAnalyzer(VADAnalyzer):
     with automatic model state management and periodic resets.
     """
 
-    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+    def __init__(
+        self,
+        *,
+        sample_rate: Optional[int] = None,
+        params: Optional[VADParams] = None,
+        model_path: Optional[str] = None,
+    ):
         """Initialize the Silero VAD analyzer.
 
         Args:
             sample_rate: Audio sample rate (8000 or 16000 Hz). If None, will be set later.
             params: VAD parameters for detection thresholds and timing.
+            model_path: Optional path to an alternative Silero ONNX file (e.g.
+                an int8-quantized export). Defaults to the bundled FP32 model.
         """
         super().__init__(sample_rate=sample_rate, params=params)
 
@@ -149,18 +176,21 @@ class SileroVADAnalyzer(VADAnalyzer):
         model_name = "silero_vad.onnx"
         package_path = "pipecat.audio.vad.data"
 
-        try:
-            import importlib_resources as impresources
-
-            model_file_path = str(impresources.files(package_path).joinpath(model_name))
-        except BaseException:
-            from importlib import resources as impresources
-
+        if model_path:
+            model_file_path = model_path
+        else:
             try:
-                with impresources.path(package_path, model_name) as f:
-                    model_file_path = f
-            except BaseException:
+                import importlib_resources as impresources
+
                 model_file_path = str(impresources.files(package_path).joinpath(model_name))
+            except BaseException:
+                from importlib import resources as impresources
+
+                try:
+                    with impresources.path(package_path, model_name) as f:
+                        model_file_path = f
+                except BaseException:
+                    model_file_path = str(impresources.files(package_path).joinpath(model_name))
 
         self._model = SileroOnnxModel(model_file_path, force_onnx_cpu=True)
 
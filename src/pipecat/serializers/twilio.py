@@ -13,6 +13,20 @@ from typing import Optional
 from loguru import logger
 from pydantic import BaseModel
 
+try:
+    # Twilio sends one JSON message per 20ms of audio, so JSON encode/decode
+    # is a per-frame hot path. Use orjson when available (C implementation,
+    # several times faster on short messages) and fall back to the stdlib.
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    _json_loads = orjson.loads
+except ModuleNotFoundError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
 from pipecat.audio.utils import create_stream_resampler, pcm_to_ulaw, ulaw_to_pcm
 from pipecat.frames.frames import (
     AudioRawFrame,
@@ -124,7 +138,7 @@ class TwilioFrameSerializer(FrameSerializer):
             return None
         elif isinstance(frame, StartInterruptionFrame):
             answer = {"event": "clear", "streamSid": self._stream_sid}
-            return json.dumps(answer)
+            return _json_dumps(answer)
         elif isinstance(frame, AudioRawFrame):
             data = frame.audio
 
@@ -139,9 +153,9 @@ class TwilioFrameSerializer(FrameSerializer):
                 "media": {"payload": payload},
             }
 
-            return json.dumps(answer)
+            return _json_dumps(answer)
         elif isinstance(frame, (TransportMessageFrame, TransportMessageUrgentFrame)):
-            return json.dumps(frame.message)
+            return _json_dumps(frame.message)
 
         # Return None for unhandled frames
         return None
@@ -225,7 +239,7 @@ class TwilioFrameSerializer(FrameSerializer):
         Returns:
             A Pipecat frame corresponding to the Twilio event, or None if unhandled.
         """
-        message = json.loads(data)
+        message = _json_loads(data)
 
         if message["event"] == "media":
             payload_base64 = message["media"]["payload"]
@@ -301,6 +301,26 @@ class LLMService(AIService):
 
             self._start_callbacks[function_name] = start_callback
 
+    def register_functions(
+        self,
+        handlers: Mapping[Optional[str], Any],
+        *,
+        cancel_on_interruption: bool = True,
+    ):
+        """Register multiple function handlers in one call.
+
+        Args:
+            handlers: Mapping of function names to handlers. Each handler should
+                accept a single FunctionCallParams parameter. Use None as a key
+                to handle all function calls with a catch-all handler.
+            cancel_on_interruption: Whether to cancel these function calls when
+                an interruption occurs. Defaults to True.
+        """
+        for function_name, handler in handlers.items():
+            self.register_function(
+                function_name, handler, cancel_on_interruption=cancel_on_interruption
+            )
+
     def register_direct_function(
         self,
         handler: DirectFunction,
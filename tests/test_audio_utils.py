@@ -0,0 +1,43 @@
+#
+# Copyright (c) 2024–2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import audioop
+import unittest
+
+import numpy as np
+
+from pipecat.audio.utils import create_default_resampler, pcm_to_ulaw, ulaw_to_pcm
+
+
+class TestULawConversion(unittest.IsolatedAsyncioTestCase):
+    """The LUT-based μ-law conversion must stay bit-identical to audioop."""
+
+    async def asyncSetUp(self):
+        self.resampler = create_default_resampler()
+
+    async def test_ulaw_to_pcm_matches_audioop(self):
+        # Every possible μ-law byte value.
+        ulaw_bytes = bytes(range(256))
+
+        converted = await ulaw_to_pcm(ulaw_bytes, 8000, 8000, self.resampler)
+
+        self.assertEqual(converted, audioop.ulaw2lin(ulaw_bytes, 2))
+
+    async def test_pcm_to_ulaw_matches_audioop(self):
+        # Every possible 16-bit sample value.
+        pcm_bytes = np.arange(65536, dtype=np.uint16).astype(np.int16).tobytes()
+
+        converted = await pcm_to_ulaw(pcm_bytes, 8000, 8000, self.resampler)
+
+        self.assertEqual(converted, audioop.lin2ulaw(pcm_bytes, 2))
+
+    async def test_round_trip(self):
+        ulaw_bytes = bytes(range(256))
+
+        pcm = await ulaw_to_pcm(ulaw_bytes, 8000, 8000, self.resampler)
+        round_tripped = await pcm_to_ulaw(pcm, 8000, 8000, self.resampler)
+
+        self.assertEqual(round_tripped, audioop.lin2ulaw(audioop.ulaw2lin(ulaw_bytes, 2), 2))
@@ -204,3 +204,33 @@ class TestFunctionAdapters(unittest.TestCase):
             }
         ]
         assert AWSBedrockLLMAdapter().to_provider_tools_format(self.tools_def) == expected
+
+    def test_from_standard_tools_caches_per_schema_object(self):
+        """Test that tool conversion is cached per ToolsSchema object."""
+
+        class CountingOpenAILLMAdapter(OpenAILLMAdapter):
+            conversions = 0
+
+            def to_provider_tools_format(self, tools_schema: ToolsSchema):
+                CountingOpenAILLMAdapter.conversions += 1
+                return super().to_provider_tools_format(tools_schema)
+
+        adapter = CountingOpenAILLMAdapter()
+
+        first = adapter.from_standard_tools(self.tools_def)
+        second = adapter.from_standard_tools(self.tools_def)
+
+        # The same schema object converts once; repeat calls return the cache.
+        assert second is first
+        assert CountingOpenAILLMAdapter.conversions == 1
+
+        # A new schema object (even an equivalent one) refreshes the cache.
+        other_tools_def = ToolsSchema(standard_tools=self.tools_def.standard_tools)
+        third = adapter.from_standard_tools(other_tools_def)
+        assert third == first
+        assert CountingOpenAILLMAdapter.conversions == 2
+
+    def test_from_standard_tools_passes_through_non_schema(self):
+        """Test that non-ToolsSchema tools are returned unchanged."""
+        tools = [{"type": "function", "function": {"name": "get_weather"}}]
+        assert OpenAILLMAdapter().from_standard_tools(tools) is tools
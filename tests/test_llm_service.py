@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2024–2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+from pipecat.services.llm_service import FunctionCallParams, LLMService
+
+
+class TestRegisterFunctions(unittest.TestCase):
+    def setUp(self):
+        self.llm = LLMService()
+
+        async def handler(params: FunctionCallParams):
+            pass
+
+        self.handler = handler
+
+    def test_registers_multiple_handlers(self):
+        async def other_handler(params: FunctionCallParams):
+            pass
+
+        self.llm.register_functions({"get_weather": self.handler, "get_time": other_handler})
+
+        self.assertTrue(self.llm.has_function("get_weather"))
+        self.assertTrue(self.llm.has_function("get_time"))
+        self.assertFalse(self.llm.has_function("unknown"))
+        self.assertEqual(self.llm._functions["get_weather"].handler, self.handler)
+        self.assertEqual(self.llm._functions["get_time"].handler, other_handler)
+
+    def test_none_key_registers_catch_all(self):
+        self.llm.register_functions({None: self.handler})
+
+        # A catch-all handler makes every function name resolvable.
+        self.assertTrue(self.llm.has_function("anything"))
+        self.assertEqual(self.llm._functions[None].handler, self.handler)
+
+    def test_cancel_on_interruption_propagates(self):
+        self.llm.register_functions(
+            {"get_weather": self.handler, None: self.handler}, cancel_on_interruption=False
+        )
+
+        self.assertFalse(self.llm._functions["get_weather"].cancel_on_interruption)
+        self.assertFalse(self.llm._functions[None].cancel_on_interruption)
+
+    def test_cancel_on_interruption_defaults_to_true(self):
+        self.llm.register_functions({"get_weather": self.handler})
+
+        self.assertTrue(self.llm._functions["get_weather"].cancel_on_interruption)
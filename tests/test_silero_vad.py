@@ -0,0 +1,43 @@
+#
+# Copyright (c) 2024–2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+from importlib import resources as impresources
+
+import numpy as np
+
+from pipecat.audio.vad.silero import SileroVADAnalyzer, _get_onnx_session
+
+
+def _bundled_model_path() -> str:
+    return str(impresources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx"))
+
+
+class TestSileroVADAnalyzer(unittest.TestCase):
+    def test_model_path_loads_alternative_model_file(self):
+        # Point model_path at the bundled model by its explicit path; the
+        # analyzer must load that file instead of resolving the package
+        # resource itself.
+        path = _bundled_model_path()
+
+        analyzer = SileroVADAnalyzer(sample_rate=16000, model_path=path)
+
+        self.assertIs(analyzer._model.session, _get_onnx_session(path))
+
+        # The analyzer built from an explicit path must still run inference.
+        silence = np.zeros(512, dtype=np.int16).tobytes()
+        confidence = analyzer.voice_confidence(silence)
+        self.assertGreaterEqual(confidence, 0.0)
+        self.assertLess(confidence, 0.5)
+
+    def test_onnx_session_is_shared_across_analyzers(self):
+        first = SileroVADAnalyzer(sample_rate=16000)
+        second = SileroVADAnalyzer(sample_rate=16000)
+
+        # One inference session per model file; per-stream state stays per
+        # instance.
+        self.assertIs(first._model.session, second._model.session)
+        self.assertIsNot(first._model, second._model)
@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2024–2025, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import importlib
+import json
+import sys
+import unittest
+import unittest.mock
+
+import pipecat.serializers.twilio as twilio
+from pipecat.frames.frames import InputDTMFFrame, KeypadEntry, StartInterruptionFrame
+from pipecat.serializers.twilio import TwilioFrameSerializer
+
+
+class TestTwilioJsonHelpers(unittest.IsolatedAsyncioTestCase):
+    async def test_serialize_produces_text_json(self):
+        # Twilio media streams require TEXT frames, so whatever JSON backend
+        # is active must emit a str that the stdlib can parse back.
+        serializer = TwilioFrameSerializer(stream_sid="MZ123")
+
+        serialized = await serializer.serialize(StartInterruptionFrame())
+
+        self.assertIsInstance(serialized, str)
+        self.assertEqual(json.loads(serialized), {"event": "clear", "streamSid": "MZ123"})
+
+    async def test_deserialize_parses_twilio_events(self):
+        serializer = TwilioFrameSerializer(stream_sid="MZ123")
+
+        frame = await serializer.deserialize(json.dumps({"event": "dtmf", "dtmf": {"digit": "5"}}))
+
+        self.assertIsInstance(frame, InputDTMFFrame)
+        self.assertEqual(frame.button, KeypadEntry.FIVE)
+
+    def test_stdlib_fallback_when_orjson_missing(self):
+        # Reload the module with orjson import blocked; the helpers must fall
+        # back to the stdlib implementations.
+        with unittest.mock.patch.dict(sys.modules, {"orjson": None}):
+            reloaded = importlib.reload(twilio)
+            self.assertIs(reloaded._json_dumps, json.dumps)
+            self.assertIs(reloaded._json_loads, json.loads)
+
+        # Restore whichever backend the environment actually provides.
+        importlib.reload(twilio)